@@ -1,25 +1,56 @@
 import os
+from dataclasses import dataclass
 from dotenv import load_dotenv
 from pathlib import Path
 
 load_dotenv(Path(__file__).parent.parent / ".env")
 
-AZURE_SPEECH_KEY = os.getenv("AZURE_SPEECH_KEY", "")
-AZURE_SPEECH_REGION = os.getenv("AZURE_SPEECH_REGION", "")
-AZURE_TRANSLATOR_KEY = os.getenv("AZURE_TRANSLATOR_KEY", "")
-AZURE_TRANSLATOR_ENDPOINT = os.getenv("AZURE_TRANSLATOR_ENDPOINT", "https://api.cognitive.microsofttranslator.com")
-AZURE_TRANSLATOR_REGION = os.getenv("AZURE_TRANSLATOR_REGION", "")
-DEFAULT_SOURCE_LANG = os.getenv("SOURCE_LANG", "en-US")
-TARGET_LANG = os.getenv("TARGET_LANG", "hi-IN")
-TTS_VOICE = os.getenv("TTS_VOICE", "hi-IN-KavyaNeural")
+
+@dataclass(frozen=True)
+class Settings:
+    """Environment-derived configuration, resolved once at import time."""
+
+    AZURE_SPEECH_KEY: str = os.getenv("AZURE_SPEECH_KEY", "")
+    AZURE_SPEECH_REGION: str = os.getenv("AZURE_SPEECH_REGION", "")
+    AZURE_TRANSLATOR_KEY: str = os.getenv("AZURE_TRANSLATOR_KEY", "")
+    AZURE_TRANSLATOR_ENDPOINT: str = os.getenv("AZURE_TRANSLATOR_ENDPOINT", "https://api.cognitive.microsofttranslator.com")
+    AZURE_TRANSLATOR_REGION: str = os.getenv("AZURE_TRANSLATOR_REGION", "")
+    DEFAULT_SOURCE_LANG: str = os.getenv("SOURCE_LANG", "en-US")
+    TARGET_LANG: str = os.getenv("TARGET_LANG", "hi-IN")
+    TTS_VOICE: str = os.getenv("TTS_VOICE", "hi-IN-KavyaNeural")
+    WS_INGEST_PATH: str = os.getenv("WS_INGEST_PATH", "/ingest")
+    WS_OUT_PATH: str = os.getenv("WS_OUT_PATH", "/out")
+    SAMPLE_RATE: int = int(os.getenv("SAMPLE_RATE", "16000"))
+    BYTES_PER_SAMPLE: int = 2
+    LOCAL_TTS_PLAYBACK: bool = os.getenv("LOCAL_TTS_PLAYBACK", "0") == "1"
+    TTS_OUTPUT_DEVICE: str = os.getenv("TTS_OUTPUT_DEVICE", "")
+    TTS_OUTPUT_CHANNELS: int = int(os.getenv("TTS_OUTPUT_CHANNELS", "2"))
+    # 16 kHz 16-bit mono keeps /out websocket audio at 32 kB/s; higher
+    # rates multiply bandwidth without helping speech intelligibility.
+    TTS_OUTPUT_SAMPLE_RATE: int = int(os.getenv("TTS_OUTPUT_SAMPLE_RATE", "16000"))
+    SEND_WS_AUDIO: bool = os.getenv("SEND_WS_AUDIO", "1") == "1"
+    TTS_RATE: str = os.getenv("TTS_RATE", "medium")
+
+
+settings = Settings()
+
+# Module-level aliases kept for existing imports.
+AZURE_SPEECH_KEY = settings.AZURE_SPEECH_KEY
+AZURE_SPEECH_REGION = settings.AZURE_SPEECH_REGION
+AZURE_TRANSLATOR_KEY = settings.AZURE_TRANSLATOR_KEY
+AZURE_TRANSLATOR_ENDPOINT = settings.AZURE_TRANSLATOR_ENDPOINT
+AZURE_TRANSLATOR_REGION = settings.AZURE_TRANSLATOR_REGION
+DEFAULT_SOURCE_LANG = settings.DEFAULT_SOURCE_LANG
+TARGET_LANG = settings.TARGET_LANG
+TTS_VOICE = settings.TTS_VOICE
 VOICE_MAP = {TARGET_LANG: TTS_VOICE}
-WS_INGEST_PATH = os.getenv("WS_INGEST_PATH", "/ingest")
-WS_OUT_PATH = os.getenv("WS_OUT_PATH", "/out")
-SAMPLE_RATE = int(os.getenv("SAMPLE_RATE", "16000"))
-BYTES_PER_SAMPLE = 2
-LOCAL_TTS_PLAYBACK = os.getenv("LOCAL_TTS_PLAYBACK", "0") == "1"
-TTS_OUTPUT_DEVICE = os.getenv("TTS_OUTPUT_DEVICE", "")
-TTS_OUTPUT_CHANNELS = int(os.getenv("TTS_OUTPUT_CHANNELS", "2"))
-TTS_OUTPUT_SAMPLE_RATE = int(os.getenv("TTS_OUTPUT_SAMPLE_RATE", str(SAMPLE_RATE)))
-SEND_WS_AUDIO = os.getenv("SEND_WS_AUDIO", "1") == "1"
-TTS_RATE = os.getenv("TTS_RATE", "medium")
+WS_INGEST_PATH = settings.WS_INGEST_PATH
+WS_OUT_PATH = settings.WS_OUT_PATH
+SAMPLE_RATE = settings.SAMPLE_RATE
+BYTES_PER_SAMPLE = settings.BYTES_PER_SAMPLE
+LOCAL_TTS_PLAYBACK = settings.LOCAL_TTS_PLAYBACK
+TTS_OUTPUT_DEVICE = settings.TTS_OUTPUT_DEVICE
+TTS_OUTPUT_CHANNELS = settings.TTS_OUTPUT_CHANNELS
+TTS_OUTPUT_SAMPLE_RATE = settings.TTS_OUTPUT_SAMPLE_RATE
+SEND_WS_AUDIO = settings.SEND_WS_AUDIO
+TTS_RATE = settings.TTS_RATE
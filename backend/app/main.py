@@ -1,14 +1,10 @@
-from pathlib import Path
-from dotenv import load_dotenv
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-# Load environment before importing modules that read it.
-BASE_DIR = Path(__file__)
-load_dotenv(BASE_DIR.parent.parent / ".env")
-
-from app.streaming.ingest_ws import router as ingest_router  # noqa: E402
-from app.streaming.out_ws import router as out_router  # noqa: E402
+# Environment is loaded once by app.config, which every module below
+# imports before reading any setting.
+from app.streaming.ingest_ws import router as ingest_router
+from app.streaming.out_ws import router as out_router
 
 app = FastAPI()
 app.add_middleware(
@@ -1,5 +1,7 @@
+_SENTENCE_ENDINGS = (".", "?", "!")
+
 def should_cut_segment(text: str, silence_ms: int, max_ms: int = 2000) -> bool:
-    if any(text.endswith(p) for p in [".", "?", "!"]):
+    if text.endswith(_SENTENCE_ENDINGS):
         return True
     if silence_ms >= max_ms:
         return True
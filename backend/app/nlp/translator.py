@@ -1,24 +1,65 @@
+import re
+from functools import lru_cache
+
 import httpx
 import orjson
 
-def translate_texts(texts: list[str], to_lang: str, key: str, endpoint: str, region: str, glossary_terms: list[str]) -> list[str]:
-    
-    url = f"{endpoint}/translate?api-version=3.0&to={to_lang}"
+_PLACEHOLDER_RE = re.compile(r"__GLOSSARY_(\d+)__")
+
+
+@lru_cache(maxsize=8)
+def _request_parts(endpoint: str, key: str, region: str, to_langs: tuple[str, ...]) -> tuple[str, dict[str, str]]:
+    """Request URL and headers; credentials and targets are constant per process."""
+    to_query = "&".join(f"to={lang}" for lang in to_langs)
+    url = f"{endpoint}/translate?api-version=3.0&{to_query}"
     headers = {"Ocp-Apim-Subscription-Key": key, "Ocp-Apim-Subscription-Region": region, "Content-Type": "application/json"}
-    terms_sorted = sorted(glossary_terms, key=len, reverse=True) if glossary_terms else []
-    placeholder_map = {f"__GLOSSARY_{i}__": term for i, term in enumerate(terms_sorted)}
-    
-    # Protect glossary terms before translation and restore after.
-
-    protected_texts = []
-    for text in texts:
-        protected = text
-        for placeholder, term in placeholder_map.items():
-            protected = protected.replace(term, placeholder)
-        protected_texts.append(protected)
+    return url, headers
+
+
+@lru_cache(maxsize=8)
+def _glossary_state(terms: tuple[str, ...]) -> tuple[tuple[str, ...], re.Pattern, dict[str, int]]:
+    """Sorted terms, protect pattern and placeholder indices for a glossary.
+
+    The glossary rarely changes between segments, so the sort and regex
+    compilation are paid once per distinct term set.
+    """
+    terms_sorted = tuple(sorted(terms, key=len, reverse=True))
+    placeholder_index = {term: i for i, term in enumerate(terms_sorted)}
+    protect_re = re.compile("|".join(re.escape(term) for term in terms_sorted))
+    return terms_sorted, protect_re, placeholder_index
+
+# One client for the process: keeps the TLS connection to Azure warm and
+# multiplexes requests over HTTP/2 instead of a new handshake per segment.
+_client: httpx.AsyncClient | None = None
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(http2=True, timeout=10)
+    return _client
+
+async def translate_texts(texts: list[str], to_langs: list[str], key: str, endpoint: str, region: str, glossary_terms: list[str]) -> dict[str, list[str]]:
+
+    url, headers = _request_parts(endpoint, key, region, tuple(to_langs))
+
+    # Protect glossary terms before translation and restore after. A single
+    # compiled alternation replaces every term in one pass instead of one
+    # str.replace scan per term.
+
+    protected_count = 0
+    if glossary_terms:
+        terms_sorted, protect_re, placeholder_index = _glossary_state(tuple(glossary_terms))
+        protected_texts = []
+        for text in texts:
+            protected, count = protect_re.subn(lambda m: f"__GLOSSARY_{placeholder_index[m.group(0)]}__", text)
+            protected_count += count
+            protected_texts.append(protected)
+    else:
+        terms_sorted = ()
+        protected_texts = texts
 
     body = [{"text": text} for text in protected_texts]
-    response = httpx.post(url, headers=headers, content=orjson.dumps(body), timeout=10)
+    response = await _get_client().post(url, headers=headers, content=orjson.dumps(body))
 
     if response.status_code != 200:
         raise RuntimeError(f"Translator returned {response.status_code}: {response.text}")
@@ -26,14 +67,20 @@ def translate_texts(texts: list[str], to_lang: str, key: str, endpoint: str, reg
 
     if not isinstance(parsed, list):
         raise RuntimeError(f"Unexpected translator payload: {parsed}")
-    output = [item["translations"][0]["text"] for item in parsed if "translations" in item]
-
-    if placeholder_map:
-        restored = []
-        for text in output:
-            restored_text = text
-            for placeholder, term in placeholder_map.items():
-                restored_text = restored_text.replace(placeholder, term)
-            restored.append(restored_text)
-        output = restored
+
+    # One request carries every target language; translations come back in
+    # the same order as the to= parameters.
+    output: dict[str, list[str]] = {lang: [] for lang in to_langs}
+    for item in parsed:
+        for lang, translation in zip(to_langs, item.get("translations", [])):
+            output[lang].append(translation["text"])
+
+    # Restoration is a no-op unless protection actually replaced something.
+    if protected_count:
+        def _restore(match: re.Match) -> str:
+            index = int(match.group(1))
+            return terms_sorted[index] if index < len(terms_sorted) else match.group(0)
+
+        for lang, translated in output.items():
+            output[lang] = [_PLACEHOLDER_RE.sub(_restore, text) for text in translated]
     return output
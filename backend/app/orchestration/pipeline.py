@@ -1,14 +1,15 @@
 import asyncio
-import io
 import json
 import logging
+import os
+import struct
 import time
 import uuid
-import wave
 from collections import defaultdict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict
+import orjson
 from fastapi import WebSocket
 
 from app.config import (
@@ -33,12 +34,10 @@ from app.nlp.segmenter import should_cut_segment
 from app.nlp.translator import translate_texts
 from app.streaming.out_ws import SUBS
 from app.stt.azure_stt import make_speech_recognizer
-import numpy as np
-import sounddevice as sd
 from app.tts.azure_tts import stream_pcm
 
 logger = logging.getLogger("pipeline")
-logger.setLevel(logging.INFO)
+logger.setLevel(os.getenv("PIPELINE_LOG_LEVEL", "INFO"))
 if not logger.handlers:
     formatter = logging.Formatter("%(asctime)s [%(levelname)s] %(message)s")
 
@@ -69,14 +68,61 @@ MAX_SEGMENT_HARD_CHARS = 40
 _local_stream = None
 _local_stream_rate = None
 _local_stream_channels = None
+# One dedicated thread for blocking PortAudio writes: the device's own
+# buffering paces it, and the default to_thread pool can't balloon with
+# a thread per in-flight chunk.
+_playback_executor: ThreadPoolExecutor | None = None
+
+
+def _get_playback_executor() -> ThreadPoolExecutor:
+    global _playback_executor
+    if _playback_executor is None:
+        _playback_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts-playback")
+    return _playback_executor
+
+
+def _ensure_local_stream(sd) -> None:
+    """Open the playback stream once; config is fixed for the process."""
+    global _local_stream, _local_stream_rate, _local_stream_channels
+    if _local_stream is not None and _local_stream_rate == TTS_OUTPUT_SAMPLE_RATE and _local_stream_channels == TTS_OUTPUT_CHANNELS:
+        return
+    if _local_stream is not None:
+        _local_stream.stop()
+        _local_stream.close()
+    _local_stream_rate = TTS_OUTPUT_SAMPLE_RATE
+    _local_stream_channels = TTS_OUTPUT_CHANNELS
+    device = TTS_OUTPUT_DEVICE if TTS_OUTPUT_DEVICE else None
+    _local_stream = sd.OutputStream(device=device, channels=TTS_OUTPUT_CHANNELS, samplerate=TTS_OUTPUT_SAMPLE_RATE, dtype="float32")
+    _local_stream.start()
+
+
+def _wav_header(num_pcm_bytes: int, sample_rate: int, channels: int = 1, sampwidth: int = BYTES_PER_SAMPLE) -> bytes:
+    """Canonical 44-byte RIFF/WAVE header for a PCM payload of known size."""
+    byte_rate = sample_rate * channels * sampwidth
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        36 + num_pcm_bytes,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        channels,
+        sample_rate,
+        byte_rate,
+        channels * sampwidth,
+        sampwidth * 8,
+        b"data",
+        num_pcm_bytes,
+    )
 
 async def handle_session(ws: WebSocket, meta_json: str) -> None:
     meta = json.loads(meta_json)
     session_id = meta.get("session_id") or str(uuid.uuid4())
     _ensure_session_logger(session_id)
     source_lang = meta.get("lang_src", DEFAULT_SOURCE_LANG)
-    target = meta.get("target") or (meta.get("targets", [])[:1] or [TARGET_LANG])[0]
-    logger.info("session start id=%s src=%s target=%s", session_id, source_lang, target)
+    targets = meta.get("targets") or ([meta.get("target")] if meta.get("target") else [TARGET_LANG])
+    logger.info("session start id=%s src=%s targets=%s", session_id, source_lang, targets)
     recognizer, audio_stream = make_speech_recognizer(AZURE_SPEECH_KEY, AZURE_SPEECH_REGION, source_lang, load_glossary_terms())
     buffer_text = ""
     silence_ms = 0
@@ -93,51 +139,100 @@ async def handle_session(ws: WebSocket, meta_json: str) -> None:
     recognizer.recognized.connect(on_recognized)
     recognizer.start_continuous_recognition()
 
-    while True:
+    # Receive runs in its own task so slow segmentation/translation work
+    # never backpressures audio ingest into the recognizer.
+    audio_ms_received = 0
+    eof = asyncio.Event()
+
+    async def _pump_audio() -> None:
+        nonlocal audio_ms_received
         try:
-            message = await asyncio.wait_for(ws.receive(), timeout=0.2)
-        except asyncio.TimeoutError:
-            message = None
-        if message and "bytes" in message:
-            payload = message["bytes"]
-            audio_stream.write(payload)
-            frame_ms = int(len(payload) / (BYTES_PER_SAMPLE * SAMPLE_RATE) * 1000)
-            silence_ms = max(0, silence_ms - frame_ms)
-        elif message and "text" in message and message["text"] == "EOF":
-            break
+            while True:
+                message = await ws.receive()
+                if message.get("type") == "websocket.disconnect":
+                    break
+                if "bytes" in message and message["bytes"]:
+                    payload = message["bytes"]
+                    audio_stream.write(payload)
+                    audio_ms_received += int(len(payload) / (BYTES_PER_SAMPLE * SAMPLE_RATE) * 1000)
+                elif message.get("text") == "EOF":
+                    break
+        finally:
+            eof.set()
 
-        while not result_queue.empty():
-            text = await result_queue.get()
-            buffer_text = f"{buffer_text} {text}".strip() if buffer_text else text
-            logger.info("stt recognized session=%s text=%s", session_id, text)
-            last_recognized_ts = time.perf_counter()
+    receiver = asyncio.create_task(_pump_audio())
+    audio_ms_seen = 0
+    eof_task = asyncio.create_task(eof.wait())
+    queue_task = None
 
-        now = time.perf_counter()
-        elapsed_ms = int((now - last_loop_ts) * 1000)
-        last_loop_ts = now
-        silence_ms = min(2000, silence_ms + elapsed_ms)
+    try:
+        while not eof.is_set():
+            # Event-driven wakeup: block on recognizer output (or EOF) and
+            # only poll on a 0.2s flush timer while text is waiting to be cut.
+            if queue_task is None:
+                queue_task = asyncio.create_task(result_queue.get())
+            timeout = 0.2 if buffer_text else None
+            done, _ = await asyncio.wait({queue_task, eof_task}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
 
-        idle_ms = int((time.perf_counter() - last_recognized_ts) * 1000) if last_recognized_ts else 0
-        should_cut = should_cut_segment(buffer_text, silence_ms) or (buffer_text and idle_ms >= 2000)
-        over_soft_limit = len(buffer_text) >= MAX_SEGMENT_CHARS and buffer_text.strip().endswith((".", "?", "!", "।", "॥", "…"))
-        over_hard_limit = len(buffer_text) >= MAX_SEGMENT_HARD_CHARS
+            # Drain whatever the recognizer produced since the last pass in one
+            # batch instead of re-awaiting the queue per result.
+            recognized = []
+            if queue_task in done:
+                recognized.append(queue_task.result())
+                queue_task = None
+                while True:
+                    try:
+                        recognized.append(result_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+            # One monotonic read serves batch timestamping, silence and idle
+            # accounting for this pass.
+            now = time.perf_counter()
+            if recognized:
+                if logger.isEnabledFor(logging.DEBUG):
+                    for text in recognized:
+                        logger.debug("stt recognized session=%s text=%s", session_id, text)
+                batch = " ".join(recognized)
+                buffer_text = f"{buffer_text} {batch}".strip() if buffer_text else batch
+                last_recognized_ts = now
+
+            audio_ms_delta = audio_ms_received - audio_ms_seen
+            audio_ms_seen = audio_ms_received
+
+            elapsed_ms = int((now - last_loop_ts) * 1000)
+            last_loop_ts = now
+            # One clamped update: elapsed time covered by received audio
+            # never counts as silence, however long the loop slept.
+            silence_ms = min(2000, max(0, silence_ms + elapsed_ms - audio_ms_delta))
 
-        if buffer_text and (should_cut or over_soft_limit or over_hard_limit):
-            chunk_id = f"{session_id}-{int(time.time()*1000)}"
-            await process_segment(session_id, chunk_id, buffer_text, target)
-            buffer_text = ""
-            silence_ms = 0
+            idle_ms = int((now - last_recognized_ts) * 1000) if last_recognized_ts else 0
+            should_cut = should_cut_segment(buffer_text, silence_ms) or (buffer_text and idle_ms >= 2000)
+            over_soft_limit = len(buffer_text) >= MAX_SEGMENT_CHARS and buffer_text.strip().endswith((".", "?", "!", "।", "॥", "…"))
+            over_hard_limit = len(buffer_text) >= MAX_SEGMENT_HARD_CHARS
 
-    recognizer.stop_continuous_recognition()
+            if buffer_text and (should_cut or over_soft_limit or over_hard_limit):
+                chunk_id = f"{session_id}-{int(time.time()*1000)}"
+                await process_segment(session_id, chunk_id, buffer_text, targets)
+                buffer_text = ""
+                silence_ms = 0
+    finally:
+        if queue_task is not None:
+            queue_task.cancel()
+        eof_task.cancel()
+        receiver.cancel()
+        recognizer.stop_continuous_recognition()
 
 
-async def process_segment(session_id: str, chunk_id: str, text: str, target: str) -> None:
+async def process_segment(session_id: str, chunk_id: str, text: str, targets: list[str]) -> None:
     terms = load_glossary_terms()
     logger.info("segment start session=%s chunk=%s text=%s", session_id, chunk_id, text)
-    translated_list = translate_texts([text], target, AZURE_TRANSLATOR_KEY, AZURE_TRANSLATOR_ENDPOINT, AZURE_TRANSLATOR_REGION, terms)
-    translated = translated_list[0] if translated_list else ""
-    logger.info("translation session=%s chunk=%s target=%s text=%s", session_id, chunk_id, target, translated)
-    await _enqueue_tts(session_id, chunk_id, translated, target)
+    # One Azure call covers every active target language.
+    translations = await translate_texts([text], targets, AZURE_TRANSLATOR_KEY, AZURE_TRANSLATOR_ENDPOINT, AZURE_TRANSLATOR_REGION, terms)
+    for target in targets:
+        translated_list = translations.get(target, [])
+        translated = translated_list[0] if translated_list else ""
+        logger.info("translation session=%s chunk=%s target=%s text=%s", session_id, chunk_id, target, translated)
+        await _enqueue_tts(session_id, chunk_id, translated, target)
     logger.info("segment done session=%s chunk=%s", session_id, chunk_id)
 
 
@@ -150,6 +245,13 @@ async def _enqueue_tts(session_id: str, chunk_id: str, translated_text: str, tar
 
 async def _tts_worker(target: str) -> None:
     global _local_stream, _local_stream_rate, _local_stream_channels
+    if LOCAL_TTS_PLAYBACK:
+        # Only local playback needs the audio stack; keep server-only
+        # deployments from importing numpy/PortAudio at module load.
+        import numpy as np
+        import sounddevice as sd
+
+        _ensure_local_stream(sd)
     lock = _tts_locks[target]
     queue = _tts_queues[target]
     while True:
@@ -164,13 +266,13 @@ async def _tts_worker(target: str) -> None:
             lead_time = min(_tts_last_duration.get(target, 0.0), TTS_LEAD_TIME_SECONDS)
             wait_for = max(0.0, expected_end - lead_time - now)
             if wait_for > 0:
-                logger.info("tts wait session=%s chunk=%s target=%s wait=%.2fs", session_id, chunk_id, target, wait_for)
+                logger.debug("tts wait session=%s chunk=%s target=%s wait=%.2fs", session_id, chunk_id, target, wait_for)
                 await asyncio.sleep(wait_for)
 
             voice = VOICE_MAP.get(target, VOICE_MAP.get("hi-IN", ""))
             logger.info("tts start session=%s chunk=%s target=%s voice=%s", session_id, chunk_id, target, voice)
             send_ts = time.time()
-            chunk_meta = json.dumps(
+            chunk_meta = orjson.dumps(
                 {
                     "session_id": session_id,
                     "chunk_id": chunk_id,
@@ -179,7 +281,7 @@ async def _tts_worker(target: str) -> None:
                     "timestamp": send_ts,
                     "duration_sec": 0.0,
                 }
-            )
+            ).decode()
             alive = []
             if SEND_WS_AUDIO:
                 clients = SUBS.get(session_id, {}).get(target, [])
@@ -191,69 +293,81 @@ async def _tts_worker(target: str) -> None:
                         logger.warning("drop closed client session=%s target=%s error=%s", session_id, target, exc)
                 SUBS.get(session_id, {}).update({target: alive})
 
-            pcm_chunks = []
+            # PCM accumulates directly behind a header placeholder, so the
+            # finished WAV never has to be reassembled from a chunk list.
+            wav_buffer = bytearray(44)
             local_play_start = None
             async for pcm in stream_pcm(translated, AZURE_SPEECH_KEY, AZURE_SPEECH_REGION, voice, TTS_OUTPUT_SAMPLE_RATE, TTS_RATE):
-                pcm_chunks.append(pcm)
+                wav_buffer += pcm
                 if LOCAL_TTS_PLAYBACK:
-                    audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+                    audio = np.frombuffer(pcm, dtype=np.int16).astype(np.float32)
+                    audio *= 1.0 / 32768.0
                     if TTS_OUTPUT_CHANNELS == 2:
-                        audio = np.repeat(audio[:, None], 2, axis=1)
-                    if _local_stream is None or _local_stream_rate != TTS_OUTPUT_SAMPLE_RATE or _local_stream_channels != TTS_OUTPUT_CHANNELS:
-                        if _local_stream is not None:
-                            _local_stream.stop()
-                            _local_stream.close()
-                        _local_stream_rate = TTS_OUTPUT_SAMPLE_RATE
-                        _local_stream_channels = TTS_OUTPUT_CHANNELS
-                        device = TTS_OUTPUT_DEVICE if TTS_OUTPUT_DEVICE else None
-                        _local_stream = sd.OutputStream(device=device, channels=TTS_OUTPUT_CHANNELS, samplerate=TTS_OUTPUT_SAMPLE_RATE, dtype="float32")
-                        _local_stream.start()
+                        # Broadcast the mono view into a contiguous stereo
+                        # buffer instead of materialising np.repeat temporaries.
+                        stereo = np.empty((audio.shape[0], 2), dtype=np.float32)
+                        stereo[:] = audio[:, None]
+                        audio = stereo
                     if local_play_start is None:
                         local_play_start = time.time()
-                        logger.info("local playback start session=%s chunk=%s target=%s ts=%.3f", session_id, chunk_id, target, local_play_start)
-                    await asyncio.to_thread(_local_stream.write, audio)
+                        logger.debug("local playback start session=%s chunk=%s target=%s ts=%.3f", session_id, chunk_id, target, local_play_start)
+                    await asyncio.get_running_loop().run_in_executor(_get_playback_executor(), _local_stream.write, audio)
 
-            pcm_bytes = b"".join(pcm_chunks)
-            duration_sec = len(pcm_bytes) / float(TTS_OUTPUT_SAMPLE_RATE * BYTES_PER_SAMPLE) if pcm_bytes else 0.0
+            pcm_len = len(wav_buffer) - 44
+            duration_sec = pcm_len / float(TTS_OUTPUT_SAMPLE_RATE * BYTES_PER_SAMPLE) if pcm_len else 0.0
             _tts_expected_end[target] = send_ts + duration_sec
             _tts_last_duration[target] = duration_sec
 
             wav_bytes = b""
-            if pcm_bytes:
-                buffer = io.BytesIO()
-                with wave.open(buffer, "wb") as wav:
-                    wav.setnchannels(1)
-                    wav.setsampwidth(BYTES_PER_SAMPLE)
-                    wav.setframerate(TTS_OUTPUT_SAMPLE_RATE)
-                    wav.writeframes(pcm_bytes)
-                wav_bytes = buffer.getvalue()
+            if pcm_len and SEND_WS_AUDIO and alive:
+                wav_buffer[:44] = _wav_header(pcm_len, TTS_OUTPUT_SAMPLE_RATE)
+                wav_bytes = bytes(wav_buffer)
 
             logger.info(
                 "tts done session=%s chunk=%s target=%s bytes=%s duration=%.2fs",
                 session_id,
                 chunk_id,
                 target,
-                len(pcm_bytes),
+                pcm_len,
                 duration_sec,
             )
             if local_play_start is not None:
-                logger.info("local playback end session=%s chunk=%s target=%s ts=%.3f duration=%.2fs", session_id, chunk_id, target, time.time(), duration_sec)
+                logger.debug("local playback end session=%s chunk=%s target=%s ts=%.3f duration=%.2fs", session_id, chunk_id, target, time.time(), duration_sec)
 
             if SEND_WS_AUDIO and alive and wav_bytes:
-                for client in alive:
-                    try:
-                        await client.send_bytes(wav_bytes)
-                    except Exception as exc:
-                        logger.warning("drop closed client session=%s target=%s error=%s", session_id, target, exc)
-                SUBS.get(session_id, {}).update({target: alive})
+                # Fan out concurrently so one slow subscriber doesn't
+                # delay the rest; failures only drop their own client.
+                results = await asyncio.gather(
+                    *(client.send_bytes(wav_bytes) for client in alive),
+                    return_exceptions=True,
+                )
+                kept = []
+                for client, result in zip(alive, results):
+                    if isinstance(result, BaseException):
+                        logger.warning("drop closed client session=%s target=%s error=%s", session_id, target, result)
+                    else:
+                        kept.append(client)
+                SUBS.get(session_id, {}).update({target: kept})
             elif SEND_WS_AUDIO and not alive:
                 logger.info("no active clients session=%s target=%s; audio dropped", session_id, target)
 
         queue.task_done()
 
 
+_glossary_cache: list[str] = []
+_glossary_cache_mtime: float | None = None
+
+
 def load_glossary_terms() -> list[str]:
+    global _glossary_cache, _glossary_cache_mtime
     path = Path(__file__).parent.parent / "glossary" / "do_not_translate.tsv"
-    if not path.exists():
-        return []
-    return [line.split("\t")[0].strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        _glossary_cache = []
+        _glossary_cache_mtime = None
+        return _glossary_cache
+    if mtime != _glossary_cache_mtime:
+        _glossary_cache = [line.split("\t")[0].strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+        _glossary_cache_mtime = mtime
+    return _glossary_cache
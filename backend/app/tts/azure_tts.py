@@ -1,64 +1,163 @@
 import asyncio
 import html
+import threading
+from functools import lru_cache
+
 import azure.cognitiveservices.speech as speechsdk
 
+_FORMAT_MAP = {
+    8000: speechsdk.SpeechSynthesisOutputFormat.Raw8Khz16BitMonoPcm,
+    16000: speechsdk.SpeechSynthesisOutputFormat.Raw16Khz16BitMonoPcm,
+    24000: speechsdk.SpeechSynthesisOutputFormat.Raw24Khz16BitMonoPcm,
+    48000: speechsdk.SpeechSynthesisOutputFormat.Raw48Khz16BitMonoPcm,
+}
+
+
+class _SharedSynthesizer:
+    """A SpeechSynthesizer reused across utterances for one voice/format.
+
+    Building SpeechConfig + SpeechSynthesizer per call re-resolved the
+    service and dropped the underlying connection every utterance. Event
+    handlers are connected once here; stream_pcm swaps per-utterance
+    callbacks in and out instead of reconnecting handlers.
+    """
+
+    def __init__(self, key: str, region: str, voice: str, sample_rate: int | None = None):
+        speech_config = speechsdk.SpeechConfig(subscription=key, region=region)
+        speech_config.speech_synthesis_voice_name = voice
+        if sample_rate is not None:
+            output_format = _FORMAT_MAP.get(sample_rate)
+            if not output_format:
+                raise ValueError(f"Unsupported TTS sample rate: {sample_rate}")
+            speech_config.set_speech_synthesis_output_format(output_format)
+        self.synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+        # Pre-open the service websocket so every utterance, including the
+        # first, reuses one warm connection instead of handshaking.
+        try:
+            self.connection = speechsdk.Connection.from_speech_synthesizer(self.synthesizer)
+            self.connection.open(for_continuous_recognition=True)
+        except Exception:
+            self.connection = None
+        self.on_audio = None
+        self.on_done = None
+        # Serializes utterances: the per-call callback slots below belong
+        # to whoever holds this for the duration of their stream.
+        self.lock = asyncio.Lock()
+        self.synthesizer.synthesizing.connect(self._handle_audio)
+        self.synthesizer.synthesis_completed.connect(self._handle_done)
+        self.synthesizer.synthesis_canceled.connect(self._handle_done)
+
+    def _handle_audio(self, evt) -> None:
+        callback = self.on_audio
+        if callback:
+            callback(evt)
+
+    def _handle_done(self, evt) -> None:
+        callback = self.on_done
+        if callback:
+            callback(evt)
+
+
+_synth_cache: dict[tuple[str, str, str, int | None], _SharedSynthesizer] = {}
+
+
+def _schedule(loop: asyncio.AbstractEventLoop, callback, *args) -> None:
+    """Schedule on the loop, skipping the threadsafe self-pipe wakeup when
+    the caller already runs on the loop thread."""
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        loop.call_soon(callback, *args)
+    else:
+        loop.call_soon_threadsafe(callback, *args)
+
+
+def _get_synthesizer(key: str, region: str, voice: str, sample_rate: int | None = None) -> _SharedSynthesizer:
+    cache_key = (key, region, voice, sample_rate)
+    shared = _synth_cache.get(cache_key)
+    if shared is None:
+        shared = _synth_cache[cache_key] = _SharedSynthesizer(key, region, voice, sample_rate)
+    return shared
+
+
 def _voice_locale(voice: str) -> str:
     parts = voice.split("-")
     if len(parts) >= 2:
         return f"{parts[0]}-{parts[1]}"
     return "en-US"
 
-def _build_ssml(text: str, voice: str, rate: str) -> str:
+@lru_cache(maxsize=16)
+def _ssml_envelope(voice: str, rate: str) -> tuple[str, str]:
+    """Constant SSML prefix/suffix for a voice and rate, built once."""
     locale = _voice_locale(voice)
-    escaped = html.escape(text)
-    return f'<speak version="1.0" xml:lang="{locale}"><voice name="{voice}"><prosody rate="{rate}">{escaped}</prosody></voice></speak>'
+    prefix = f'<speak version="1.0" xml:lang="{locale}"><voice name="{voice}"><prosody rate="{rate}">'
+    return prefix, "</prosody></voice></speak>"
+
+def _build_ssml(text: str, voice: str, rate: str) -> str:
+    prefix, suffix = _ssml_envelope(voice, rate)
+    return f"{prefix}{html.escape(text)}{suffix}"
 
 def synth_wav(text: str, key: str, region: str, voice: str, rate: str = "medium") -> bytes:
-    speech_config = speechsdk.SpeechConfig(subscription=key, region=region)
-    speech_config.speech_synthesis_voice_name = voice
-    # speech_config.set_speech_synthesis_output_format(speechsdk.SpeechSynthesisOutputFormat.Riff48Khz16BitMonoPcm)
-    synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+    shared = _get_synthesizer(key, region, voice)
     ssml = _build_ssml(text, voice, rate)
-    result = synthesizer.speak_ssml_async(ssml).get()
+    result = shared.synthesizer.speak_ssml_async(ssml).get()
     return bytes(result.audio_data)
 
 async def stream_pcm(text: str, key: str, region: str, voice: str, sample_rate: int, rate: str = "medium"):
-    speech_config = speechsdk.SpeechConfig(subscription=key, region=region)
-    speech_config.speech_synthesis_voice_name = voice
-    format_map = {
-        8000: speechsdk.SpeechSynthesisOutputFormat.Raw8Khz16BitMonoPcm,
-        16000: speechsdk.SpeechSynthesisOutputFormat.Raw16Khz16BitMonoPcm,
-        24000: speechsdk.SpeechSynthesisOutputFormat.Raw24Khz16BitMonoPcm,
-        48000: speechsdk.SpeechSynthesisOutputFormat.Raw48Khz16BitMonoPcm,
-    }
-    output_format = format_map.get(sample_rate)
-    if not output_format:
-        raise ValueError(f"Unsupported TTS sample rate: {sample_rate}")
-    speech_config.set_speech_synthesis_output_format(output_format)
-    synthesizer = speechsdk.SpeechSynthesizer(speech_config=speech_config, audio_config=None)
+    shared = _get_synthesizer(key, region, voice, sample_rate)
     loop = asyncio.get_running_loop()
-    queue: asyncio.Queue[bytes] = asyncio.Queue()
-    done = asyncio.Event()
+    queue: asyncio.Queue = asyncio.Queue()
+    # Completion rides the same queue as the audio: loop callbacks run in
+    # FIFO order, so the sentinel can never overtake a pending flush.
+    done_sentinel = object()
+
+    # Audio callbacks arrive on the SDK thread. Chunks collect in a local
+    # buffer and a single flush is scheduled on the loop while one is not
+    # already pending, instead of one call_soon_threadsafe per chunk.
+    pending: list[bytes] = []
+    pending_lock = threading.Lock()
+    flush_scheduled = False
+
+    def _flush():
+        nonlocal flush_scheduled
+        with pending_lock:
+            chunks = pending[:]
+            pending.clear()
+            flush_scheduled = False
+        if chunks:
+            queue.put_nowait(chunks[0] if len(chunks) == 1 else b"".join(chunks))
 
     def on_synth(evt):
+        nonlocal flush_scheduled
         audio = evt.result.audio_data
-        if audio:
-            loop.call_soon_threadsafe(queue.put_nowait, audio)
+        if not audio:
+            return
+        with pending_lock:
+            pending.append(audio)
+            schedule = not flush_scheduled
+            flush_scheduled = True
+        if schedule:
+            _schedule(loop, _flush)
 
     def on_done(_evt):
-        loop.call_soon_threadsafe(done.set)
-
-    synthesizer.synthesizing.connect(on_synth)
-    synthesizer.synthesis_completed.connect(on_done)
-    synthesizer.synthesis_canceled.connect(on_done)
+        _schedule(loop, queue.put_nowait, done_sentinel)
 
     ssml = _build_ssml(text, voice, rate)
-    synthesizer.start_speaking_ssml_async(ssml)
-    while True:
-        if done.is_set() and queue.empty():
-            break
+    # Hold the synthesizer for the whole utterance: concurrent callers
+    # for the same voice/format would otherwise overwrite each other's
+    # callback slots and the loser would wait on its sentinel forever.
+    async with shared.lock:
+        shared.on_audio = on_synth
+        shared.on_done = on_done
         try:
-            chunk = await asyncio.wait_for(queue.get(), timeout=0.1)
-        except asyncio.TimeoutError:
-            continue
-        yield chunk
+            shared.synthesizer.start_speaking_ssml_async(ssml)
+            while True:
+                chunk = await queue.get()
+                if chunk is done_sentinel:
+                    break
+                yield chunk
+        finally:
+            shared.on_audio = None
+            shared.on_done = None
@@ -0,0 +1,9 @@
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+
+load_dotenv(Path(__file__).resolve().parents[1] / ".env")
+
+SAMPLE_RATE = 16000
+TARGET = os.getenv("TARGET_LANG", "hi-IN")
+SOURCE = os.getenv("SOURCE_LANG", "en-US")
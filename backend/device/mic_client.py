@@ -2,33 +2,33 @@ import asyncio
 import json
 import uuid
 
-import numpy as np
-import os
-from pathlib import Path
-from dotenv import load_dotenv
 import sounddevice as sd
 import websockets
 
-SAMPLE_RATE = 16000
+from common import SAMPLE_RATE, SOURCE, TARGET
+
 CHANNELS = 1
 CHUNK = 320  # 20ms
-load_dotenv(Path(__file__).resolve().parents[1] / ".env")
 
 SESSION_ID = str(uuid.uuid4())
-TARGET = os.getenv("TARGET_LANG", "hi-IN")
-SOURCE = os.getenv("SOURCE_LANG", "en-US")
 
 
 async def run() -> None:
     async with websockets.connect("ws://localhost:8080/ingest") as ws:
         await ws.send(json.dumps({"session_id": SESSION_ID, "lang_src": SOURCE, "target": TARGET}))
+        loop = asyncio.get_running_loop()
+        pcm_queue: asyncio.Queue[bytes] = asyncio.Queue()
 
+        # The PortAudio callback runs on its own thread; hand frames to the
+        # running loop instead of spinning up (and tearing down) a fresh
+        # event loop per 20ms frame with asyncio.run. Capturing as int16
+        # lets the frame go straight to bytes with no scale/convert pass.
         def callback(indata, frames, time_info, status):
-            pcm = (indata.copy() * 32767).astype("<i2").tobytes()
-            asyncio.run(ws.send(pcm))
+            loop.call_soon_threadsafe(pcm_queue.put_nowait, bytes(indata))
 
-        with sd.InputStream(channels=CHANNELS, samplerate=SAMPLE_RATE, blocksize=CHUNK, dtype="float32", callback=callback):
-            await asyncio.Future()
+        with sd.RawInputStream(channels=CHANNELS, samplerate=SAMPLE_RATE, blocksize=CHUNK, dtype="int16", callback=callback):
+            while True:
+                await ws.send(await pcm_queue.get())
 
 
 if __name__ == "__main__":
@@ -1,19 +1,17 @@
 import asyncio
-import io
 import json
+import logging
 import os
+import struct
 import time
-import wave
 from pathlib import Path
-from dotenv import load_dotenv
 import numpy as np
 import sounddevice as sd
 import websockets
 
-load_dotenv(Path(__file__).resolve().parents[1] / ".env")
+from common import TARGET
 
 SESSION_ID = os.getenv("SESSION_ID", "07ef71fe-5249-410e-a6e2-873777fb41cf")
-TARGET = os.getenv("TARGET_LANG", "hi-IN")
 BACKEND_URL = os.getenv("BACKEND_URL", "ws://localhost:8080")
 LOG_EVERY_CHUNKS = int(os.getenv("LOG_EVERY_CHUNKS", "1"))
 OUTPUT_DEVICE = os.getenv("OUTPUT_DEVICE", "BlackHole 64ch")
@@ -22,64 +20,217 @@ OBS_LOG_PATH = LOG_DIR / f"obs-{SESSION_ID}.log"
 
 _stream = None
 _stream_rate = None
-_stream_lock = asyncio.Lock()
+_ring = None
 _pending_meta = None
+RING_SECONDS = 60
 
-def _append_log(line: str) -> None:
+
+class _RingBuffer:
+    """Single-producer single-consumer ring of mono float32 samples.
+
+    The asyncio task pushes, the PortAudio callback pops; with one reader
+    and one writer the monotonically increasing indices make it safe
+    without a lock. Mono is stored and broadcast into both output
+    channels on the way out, so the stereo duplication never allocates.
+    """
+
+    def __init__(self, capacity: int):
+        self._buf = np.zeros(capacity, dtype=np.float32)
+        self._capacity = capacity
+        self._read = 0
+        self._write = 0
+
+    def available_write(self) -> int:
+        return self._capacity - (self._write - self._read)
+
+    def available_read(self) -> int:
+        return self._write - self._read
+
+    def push(self, samples: np.ndarray) -> None:
+        count = len(samples)
+        pos = self._write % self._capacity
+        first = min(count, self._capacity - pos)
+        self._buf[pos:pos + first] = samples[:first]
+        if first < count:
+            self._buf[:count - first] = samples[first:]
+        self._write += count
+
+    def pop_into(self, out: np.ndarray) -> int:
+        wanted = out.shape[0]
+        count = min(wanted, self.available_read())
+        pos = self._read % self._capacity
+        first = min(count, self._capacity - pos)
+        out[:first] = self._buf[pos:pos + first, None]
+        if first < count:
+            out[first:count] = self._buf[:count - first, None]
+        if count < wanted:
+            out[count:] = 0.0
+        self._read += count
+        return count
+
+_log_queue: asyncio.Queue = asyncio.Queue()
+
+
+class _QueueLogHandler(logging.Handler):
+    """Formats records only when emitted and hands them to the writer task."""
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            _log_queue.put_nowait(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+logger = logging.getLogger("obs_bridge")
+logger.setLevel(os.getenv("OBS_LOG_LEVEL", "INFO"))
+if not logger.handlers:
+    _formatter = logging.Formatter("[%(asctime)s] %(message)s", datefmt="%H:%M:%S")
+    _console = logging.StreamHandler()
+    _console.setFormatter(_formatter)
+    logger.addHandler(_console)
+    _queue_handler = _QueueLogHandler()
+    _queue_handler.setFormatter(_formatter)
+    logger.addHandler(_queue_handler)
+
+
+async def _log_writer() -> None:
+    """Drain queued log lines to the session log file in batches."""
     OBS_LOG_PATH.parent.mkdir(parents=True, exist_ok=True)
     with OBS_LOG_PATH.open("a", encoding="utf-8") as handle:
-        handle.write(f"{line}\n")
+        while True:
+            lines = [await _log_queue.get()]
+            while True:
+                try:
+                    lines.append(_log_queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            handle.write("".join(f"{line}\n" for line in lines))
+            handle.flush()
+
+def _peek_wav_header(buf: bytearray) -> tuple[int | None, int]:
+    """Sample rate and PCM offset of a WAV header arriving in a buffer.
+
+    Walks the RIFF chunks with struct instead of the wave module: the
+    canonical 44-byte header the backend emits resolves in two steps, and
+    extra chunks are skipped by their declared size rather than a byte
+    scan that could false-match inside chunk data. Returns (None, 0)
+    while more bytes are needed to reach the data chunk.
+    """
+    if len(buf) < 12:
+        return None, 0
+    offset = 12
+    rate = None
+    while offset + 8 <= len(buf):
+        chunk_id, size = struct.unpack_from("<4sI", buf, offset)
+        if chunk_id == b"fmt ":
+            if offset + 16 > len(buf):
+                return None, 0
+            rate = struct.unpack_from("<I", buf, offset + 12)[0]
+        elif chunk_id == b"data":
+            return rate, offset + 8
+        offset += 8 + size + (size & 1)
+    return None, 0
+
+
+def _playback_callback(outdata, frames, time_info, status) -> None:
+    _ring.pop_into(outdata)
+
 
 def _ensure_stream(sample_rate: int) -> None:
-    global _stream, _stream_rate
+    global _stream, _stream_rate, _ring
     if _stream is None or _stream_rate != sample_rate:
         if _stream is not None:
             _stream.stop()
             _stream.close()
         _stream_rate = sample_rate
+        _ring = _RingBuffer(sample_rate * RING_SECONDS)
         _stream = sd.OutputStream(
             device=OUTPUT_DEVICE,
             channels=2,
             samplerate=_stream_rate,
             dtype="float32",
+            callback=_playback_callback,
         )
         _stream.start()
 
+
+async def _push_audio(samples: np.ndarray) -> None:
+    """Feed mono samples into the ring, yielding while the device catches up."""
+    pos = 0
+    total = len(samples)
+    while pos < total:
+        space = _ring.available_write()
+        if space == 0:
+            await asyncio.sleep(0.02)
+            continue
+        take = min(space, total - pos)
+        _ring.push(samples[pos:pos + take])
+        pos += take
+
 async def _listen_target() -> None:
     ws_url = f"{BACKEND_URL}/out/{SESSION_ID}/{TARGET}"
     chunk_count = 0
-    async with websockets.connect(ws_url, max_size=None) as ws:
-        while True:
-            message = await ws.recv()
-            if isinstance(message, str):
-                meta = json.loads(message)
-                if meta.get("sample_rate"):
-                    continue
-                _pending_meta = meta
+    # File logging happens off the hot path: lines are queued here and a
+    # writer task appends them, instead of one to_thread hop per chunk.
+    log_task = asyncio.create_task(_log_writer())
+    try:
+        async with websockets.connect(ws_url, max_size=None) as ws:
+            await _stream_messages(ws, chunk_count)
+    finally:
+        log_task.cancel()
+
+
+async def _stream_messages(ws, chunk_count: int) -> None:
+    global _pending_meta
+    while True:
+        # Consume each message as websocket fragments so a long
+        # utterance starts playing while the rest is still in flight,
+        # instead of buffering the whole WAV first.
+        text_parts: list[str] = []
+        pending = bytearray()
+        rate = None
+        total_samples = 0
+        write_start = None
+        async for fragment in ws.recv_streaming():
+            if isinstance(fragment, str):
+                text_parts.append(fragment)
                 continue
-            with wave.open(io.BytesIO(message), "rb") as wav:
-                frames = wav.readframes(wav.getnframes())
-                audio = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
-                rate = wav.getframerate()
-            chunk_count += 1
-            if LOG_EVERY_CHUNKS and chunk_count % LOG_EVERY_CHUNKS == 0:
-                now = time.strftime("%H:%M:%S")
-                print(f"[{now}] target={TARGET} chunk={chunk_count} samples={len(audio)} rate={rate}")
-            stereo = np.repeat(audio[:, None], 2, axis=1)
-            async with _stream_lock:
+            pending += fragment
+            if rate is None:
+                if len(pending) < 44:
+                    continue
+                rate, pcm_offset = _peek_wav_header(pending)
+                if rate is None:
+                    continue
+                del pending[:pcm_offset]
+                chunk_count += 1
                 _ensure_stream(rate)
-                started_at = time.strftime("%H:%M:%S")
+                # Lazy %s args: the timestamp and line are only rendered by
+                # the handlers, not rebuilt per chunk in the hot loop.
                 if _pending_meta:
-                    start_line = f"[{started_at}] start chunk={chunk_count} text={_pending_meta.get('text','')} target={TARGET}"
+                    logger.info("start chunk=%s text=%s target=%s", chunk_count, _pending_meta.get("text", ""), TARGET)
                 else:
-                    start_line = f"[{started_at}] start chunk={chunk_count} target={TARGET}"
-                print(start_line)
-                await asyncio.to_thread(_append_log, start_line)
+                    logger.info("start chunk=%s target=%s", chunk_count, TARGET)
                 write_start = time.perf_counter()
-                await asyncio.to_thread(_stream.write, stereo)
-                write_elapsed = time.perf_counter() - write_start
-            chunk_duration = len(audio) / float(rate)
-            _pending_meta = None
+            usable = len(pending) - (len(pending) % 2)
+            if usable:
+                audio = np.frombuffer(bytes(pending[:usable]), dtype=np.int16).astype(np.float32)
+                audio *= 1.0 / 32768.0
+                del pending[:usable]
+                total_samples += len(audio)
+                await _push_audio(audio)
+        if text_parts:
+            meta = json.loads("".join(text_parts))
+            if not meta.get("sample_rate"):
+                _pending_meta = meta
+            continue
+        if rate is None:
+            continue
+        write_elapsed = time.perf_counter() - write_start if write_start else 0.0
+        if LOG_EVERY_CHUNKS and chunk_count % LOG_EVERY_CHUNKS == 0:
+            logger.info("target=%s chunk=%s samples=%s rate=%s", TARGET, chunk_count, total_samples, rate)
+        chunk_duration = total_samples / float(rate)
+        _pending_meta = None
 
 async def run() -> None:
     default_output = sd.default.device[1]
@@ -1,34 +1,33 @@
-import asyncio, json, os, uuid, subprocess, websockets
-from pathlib import Path
-from dotenv import load_dotenv
+import asyncio, json, os, websockets
 
-env_path = Path(__file__).resolve().parents[1] / ".env"
-load_dotenv(env_path)
+from common import SAMPLE_RATE, SOURCE, TARGET
 
 MP3_PATH = os.getenv("MP3_PATH", "/Users/abhishekunnam/Projects/realtime-translation-app/audios/test.mp3")
 SESSION = os.getenv("SESSION_ID", "07ef71fe-5249-410e-a6e2-873777fb41cf")
 WS_URL = os.getenv("BACKEND_URL", "ws://localhost:8080/ingest")
-SAMPLE_RATE = 16000
 FRAME_MS = 20
 BYTES_PER_FRAME = int(SAMPLE_RATE * FRAME_MS / 1000 * 2)  # PCM16 mono
-TARGET = os.getenv("TARGET_LANG", "hi-IN")
-SOURCE = os.getenv("SOURCE_LANG", "en-US")
+FRAMES_PER_SEND = 5  # 100ms per websocket message
 
 async def main():
     async with websockets.connect(WS_URL) as ws:
         await ws.send(json.dumps({"session_id": SESSION, "lang_src": SOURCE, "target": TARGET}))
-        proc = subprocess.Popen(
-            ["ffmpeg", "-i", MP3_PATH, "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1"],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.DEVNULL,
+        # Async subprocess: pipe reads await decoded bytes instead of
+        # blocking the event loop (and the websocket) on proc.stdout.read.
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-i", MP3_PATH, "-f", "s16le", "-ac", "1", "-ar", str(SAMPLE_RATE), "pipe:1",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
         )
+        # Send several frames per message: one websocket/TCP round per 100ms
+        # of audio instead of per 20ms frame.
         while True:
-            chunk = proc.stdout.read(BYTES_PER_FRAME)
+            chunk = await proc.stdout.read(BYTES_PER_FRAME * FRAMES_PER_SEND)
             if not chunk:
                 break
             await ws.send(chunk)
-            await asyncio.sleep(FRAME_MS / 1000)
+            await asyncio.sleep(len(chunk) / BYTES_PER_FRAME * FRAME_MS / 1000)
         await ws.send("EOF")
-    proc.wait()
+    await proc.wait()
 
 asyncio.run(main())
@@ -10,7 +10,6 @@ import os
 import sys
 import time
 from collections import deque
-from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 from typing import Deque, Optional, Tuple
@@ -106,21 +105,20 @@ class TranslationTranscriptEmitter(FrameProcessor):
         await self.push_frame(frame, direction)
 
 
-@dataclass
-class TranscriptChunk:
-    """Represents a single STT chunk with timestamp metadata."""
-
-    id: str
-    text: str
-    timestamp: float
-
-
 class TranscriptionChunkBuffer(FrameProcessor):
-    """Captures STT output in chronological order and tags frames with chunk metadata."""
+    """Captures STT output in chronological order and tags frames with chunk metadata.
+
+    History is kept structure-of-arrays style — parallel deques of ids,
+    texts and timestamps — instead of one dataclass instance per chunk,
+    so retention costs three slot appends rather than an object
+    allocation per chunk and the columns can be consumed directly.
+    """
 
     def __init__(self, history_size: int = 200) -> None:
         super().__init__(name="transcription-chunk-buffer")
-        self._history: Deque[TranscriptChunk] = deque(maxlen=history_size)
+        self._ids: Deque[str] = deque(maxlen=history_size)
+        self._texts: Deque[str] = deque(maxlen=history_size)
+        self._timestamps: Deque[float] = deque(maxlen=history_size)
         self._counter = 0
 
     async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
@@ -132,7 +130,9 @@ class TranscriptionChunkBuffer(FrameProcessor):
             timestamp = time.time()
             frame.metadata["chunk_id"] = chunk_id
             frame.metadata["chunk_timestamp"] = timestamp
-            self._history.append(TranscriptChunk(id=chunk_id, text=frame.text, timestamp=timestamp))
+            self._ids.append(chunk_id)
+            self._texts.append(frame.text)
+            self._timestamps.append(timestamp)
             logger.info("[stt] chunk={} timestamp={:.3f} text={}", chunk_id, timestamp, frame.text)
 
         await self.push_frame(frame, direction)
@@ -146,48 +146,47 @@ class SequentialTranslationQueue(FrameProcessor):
         self._language = language
         self._queue: asyncio.Queue[Tuple[LLMTextFrame, FrameDirection]] = asyncio.Queue()
         self._drain_task: Optional[asyncio.Task] = None
-        self._drain_lock = asyncio.Lock()
 
     async def process_frame(self, frame: Frame, direction: FrameDirection) -> None:
         await super().process_frame(frame, direction)
 
         if direction is FrameDirection.DOWNSTREAM and isinstance(frame, LLMTextFrame):
+            # Enqueue and return immediately: upstream translation keeps
+            # producing while the persistent drain task streams chunks to
+            # TTS one at a time.
             await self._queue.put((frame, direction))
-            await self._ensure_drain()
+            if self._drain_task is None:
+                self._drain_task = asyncio.create_task(self._drain_queue())
         else:
             await self.push_frame(frame, direction)
 
-    async def _ensure_drain(self) -> None:
-        if self._drain_task and not self._drain_task.done():
-            return
-        self._drain_task = asyncio.create_task(self._drain_queue())
-
     async def _drain_queue(self) -> None:
-        async with self._drain_lock:
-            while not self._queue.empty():
-                frame, direction = await self._queue.get()
-                chunk_id = frame.metadata.get("chunk_id", "unknown")
+        # One long-lived task per language blocks on the queue instead of
+        # being respawned (and re-polling empty()) for every burst.
+        while True:
+            frame, direction = await self._queue.get()
+            chunk_id = frame.metadata.get("chunk_id", "unknown")
+            logger.info(
+                "[translation] language={} chunk={} text={}",
+                self._language,
+                chunk_id,
+                frame.text,
+            )
+            try:
+                await self.push_frame(frame, direction)
                 logger.info(
-                    "[translation] language={} chunk={} text={}",
+                    "[translation-output] language={} chunk={} text={}",
                     self._language,
                     chunk_id,
                     frame.text,
                 )
-                try:
-                    await self.push_frame(frame, direction)
-                    logger.info(
-                        "[translation-output] language={} chunk={} text={}",
-                        self._language,
-                        chunk_id,
-                        frame.text,
-                    )
-                    logger.info(
-                        "[translation] language={} chunk={} status=delivered",
-                        self._language,
-                        chunk_id,
-                    )
-                finally:
-                    self._queue.task_done()
+                logger.info(
+                    "[translation] language={} chunk={} status=delivered",
+                    self._language,
+                    chunk_id,
+                )
+            finally:
+                self._queue.task_done()
 
 
 class TranscriptionStreamAdapter(FrameProcessor):
@@ -248,6 +247,11 @@ class DirectTranslationProcessor(FrameProcessor):
                 {"role": "user", "content": text},
             ]
         )
+        # One-shot inference by design: run_inference is the only
+        # out-of-pipeline API OpenAILLMService exposes; streaming tokens
+        # here would mean driving the service's private client directly.
+        # Sentence-level overlap with TTS instead comes from upstream
+        # segmentation keeping chunks short.
         translation = await self._llm.run_inference(context)
         translation = (translation or "").strip()
         if not translation:
@@ -8,21 +8,18 @@ import argparse
 import asyncio
 import os
 import sys
-import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-import numpy as np
-from daily import Daily, CallClient
 from dotenv import load_dotenv
 from loguru import logger
-from pipecat.transports.daily.utils import (
-    DailyMeetingTokenParams,
-    DailyMeetingTokenProperties,
-    DailyRESTHelper,
-)
-import pydub
+
+# Heavy dependencies (numpy, soundfile/soxr, daily, pipecat, pydub) are
+# imported inside the functions that need them, so discovery runs like
+# --list don't pay hundreds of ms of import time to glob a directory.
 
 load_dotenv(override=True)
 
@@ -32,8 +29,87 @@ logger.add(sys.stderr, level="INFO")
 # Supported audio formats
 AUDIO_EXTENSIONS = {".mp3", ".wav", ".m4a", ".aac", ".ogg", ".flac", ".opus", ".mp4"}
 
+# Formats libsndfile cannot decode; these fall back to pydub/ffmpeg.
+PYDUB_ONLY_EXTENSIONS = {".m4a", ".aac", ".mp4"}
+
 SAMPLE_RATE = 16000
 NUM_CHANNELS = 1
+# 20ms quanta batched into each write_frames call. 100ms writes cut the
+# FFI crossings 5x and keep the device ring buffer pre-filled, so a
+# scheduler hiccup shorter than a super-chunk can't drain it.
+FRAMES_PER_WRITE = 5
+
+
+_daily_initialized = False
+_virtual_mic = None
+
+
+def _ensure_daily() -> None:
+    """Initialize the Daily runtime once per process."""
+    global _daily_initialized
+    if not _daily_initialized:
+        from daily import Daily
+
+        Daily.init()
+        _daily_initialized = True
+
+
+def _get_virtual_mic():
+    """Create the virtual microphone device once per process.
+
+    Device creation registers the mic with the Daily runtime; repeating
+    it per streamed file leaks the previous device and forces
+    renegotiation, so playlist-style callers reuse one device.
+    """
+    global _virtual_mic
+    if _virtual_mic is None:
+        from daily import Daily
+
+        _virtual_mic = Daily.create_microphone_device(
+            "local-audio-mic",
+            sample_rate=SAMPLE_RATE,
+            channels=NUM_CHANNELS,
+            non_blocking=True
+        )
+    return _virtual_mic
+
+
+def _resample_mono(mono, source_rate: int, target_rate: int):
+    """Polyphase resample of float32 mono samples.
+
+    Prefers soxr's SIMD resampler and falls back to
+    scipy.signal.resample_poly; raises ImportError when neither is
+    installed so callers can keep their own last resort.
+    """
+    try:
+        import soxr
+
+        return soxr.resample(mono, source_rate, target_rate)
+    except ImportError:
+        pass
+
+    from math import gcd
+
+    import numpy as np
+    from scipy.signal import resample_poly
+
+    g = gcd(target_rate, source_rate)
+    return resample_poly(mono, target_rate // g, source_rate // g).astype(np.float32, copy=False)
+
+
+def _float_to_int16(samples):
+    """Convert float32 samples in [-1, 1] to int16 PCM.
+
+    Scales, rounds and clips through the input buffer with out= ufuncs —
+    one SIMD pass per stage with no chained temporaries — and only the
+    final astype materializes the int16 copy.
+    """
+    import numpy as np
+
+    np.multiply(samples, 32767.0, out=samples)
+    np.rint(samples, out=samples)
+    np.clip(samples, -32768.0, 32767.0, out=samples)
+    return samples.astype(np.int16)
 
 
 class LocalAudioStreamer:
@@ -42,12 +118,17 @@ class LocalAudioStreamer:
     def __init__(self, room_url: str, token: Optional[str] = None):
         self.room_url = room_url
         self.token = token
-        self.client: Optional[CallClient] = None
+        self.client = None
         self.virtual_mic = None
-        self.audio_samples: Optional[np.ndarray] = None
+        self.audio_samples = None
         self.is_streaming = False
         self.keep_running = False
-        self.stream_thread: Optional[threading.Thread] = None
+        # Dedicated single-thread executor for the soft-realtime stream
+        # loop, mirroring the backend's TTS playback executor.
+        self._stream_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-stream")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stream_future = None
+        self._http_session = None
 
     async def _get_token(self) -> str:
         """Get or generate a Daily meeting token."""
@@ -60,25 +141,42 @@ class LocalAudioStreamer:
                 "DAILY_API_KEY not set. Required to generate meeting token."
             )
 
-        import aiohttp
-        async with aiohttp.ClientSession() as session:
-            daily_rest_helper = DailyRESTHelper(
-                daily_api_key=api_key,
-                daily_api_url=os.getenv("DAILY_API_URL", "https://api.daily.co/v1"),
-                aiohttp_session=session,
-            )
-
-            token = await daily_rest_helper.get_token(
-                self.room_url,
-                expiry_time=60 * 60,  # 1 hour
-                params=DailyMeetingTokenParams(
-                    properties=DailyMeetingTokenProperties(
-                        start_video_off=True, start_audio_off=False
-                    )
-                ),
-            )
-
-            return token
+        from pipecat.transports.daily.utils import (
+            DailyMeetingTokenParams,
+            DailyMeetingTokenProperties,
+            DailyRESTHelper,
+        )
+
+        daily_rest_helper = DailyRESTHelper(
+            daily_api_key=api_key,
+            daily_api_url=os.getenv("DAILY_API_URL", "https://api.daily.co/v1"),
+            aiohttp_session=self._get_http_session(),
+        )
+
+        token = await daily_rest_helper.get_token(
+            self.room_url,
+            expiry_time=60 * 60,  # 1 hour
+            params=DailyMeetingTokenParams(
+                properties=DailyMeetingTokenProperties(
+                    start_video_off=True, start_audio_off=False
+                )
+            ),
+        )
+
+        return token
+
+    def _get_http_session(self):
+        """One aiohttp session for the streamer's lifetime.
+
+        Built per request before, which paid the TCP+TLS handshake for
+        every call to api.daily.co; keeping it open enables keep-alive
+        if token refresh is ever added. Closed in cleanup().
+        """
+        if self._http_session is None:
+            import aiohttp
+
+            self._http_session = aiohttp.ClientSession()
+        return self._http_session
 
     def _load_audio_file(self, audio_path: Path):
         """Load and process local audio file."""
@@ -91,22 +189,42 @@ class LocalAudioStreamer:
                 f"Supported formats: {', '.join(AUDIO_EXTENSIONS)}"
             )
 
+        import numpy as np
+
         logger.info(f"Loading audio from: {audio_path}")
 
-        # Load audio file using pydub
+        # Repeat runs of the same file skip the decode+resample entirely:
+        # the 16kHz mono int16 PCM is cached in a .npy sidecar next to the
+        # source, invalidated when the source is newer than the cache.
+        cache_path = audio_path.with_suffix(audio_path.suffix + ".16k.s16.npy")
         try:
-            audio_segment = pydub.AudioSegment.from_file(str(audio_path))
-            logger.info(
-                f"Original audio: {audio_segment.frame_rate}Hz, "
-                f"{audio_segment.channels} channel(s), "
-                f"{len(audio_segment)}ms duration"
-            )
-
-            # Convert to 16kHz mono for Daily compatibility
-            audio_segment = audio_segment.set_frame_rate(SAMPLE_RATE).set_channels(NUM_CHANNELS)
+            if cache_path.exists() and cache_path.stat().st_mtime >= audio_path.stat().st_mtime:
+                # Memory-map rather than read: the open is O(1) regardless
+                # of file size, pages come in on demand, and concurrent
+                # streamers of the same file share them.
+                samples = np.load(cache_path, mmap_mode="r")
+                # Playback walks the mapping strictly linearly, so tell
+                # the kernel up front: aggressive readahead plus an async
+                # prefetch of the whole range, instead of one soft page
+                # fault at a time in the soft-realtime thread.
+                import mmap
+
+                backing = getattr(samples, "_mmap", None)
+                if backing is not None:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        backing.madvise(mmap.MADV_SEQUENTIAL)
+                    if hasattr(mmap, "MADV_WILLNEED"):
+                        backing.madvise(mmap.MADV_WILLNEED)
+                logger.info(f"Loaded cached PCM from {cache_path.name}: {len(samples)} samples")
+                return samples
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable PCM cache {cache_path.name}: {e}")
 
-            # Convert to numpy array (int16 PCM)
-            samples = np.array(audio_segment.get_array_of_samples(), dtype=np.int16)
+        try:
+            if audio_path.suffix.lower() in PYDUB_ONLY_EXTENSIONS:
+                samples = self._decode_with_pydub(audio_path)
+            else:
+                samples = self._decode_with_soundfile(audio_path)
 
             duration_seconds = len(samples) / SAMPLE_RATE
             logger.info(
@@ -114,54 +232,170 @@ class LocalAudioStreamer:
                 f"({duration_seconds:.2f} seconds)"
             )
 
+            try:
+                np.save(cache_path, samples)
+            except OSError as e:
+                logger.warning(f"Could not write PCM cache {cache_path.name}: {e}")
+
             return samples
 
         except Exception as e:
             logger.error(f"Failed to load audio file: {e}")
             raise RuntimeError(f"Error loading audio file: {e}") from e
 
+    def _decode_with_soundfile(self, audio_path: Path):
+        """Decode via libsndfile in blocks and resample with soxr.
+
+        Reads one-second blocks through a stateful soxr resampler
+        instead of decoding the whole file at once, so the float32
+        intermediates never exceed a block no matter how long the
+        source is; only the final int16 result is held in full.
+        """
+        import numpy as np
+        import soundfile
+        import soxr
+
+        with soundfile.SoundFile(str(audio_path)) as snd:
+            source_rate = snd.samplerate
+            logger.info(
+                f"Original audio: {source_rate}Hz, "
+                f"{snd.channels} channel(s), "
+                f"{snd.frames / source_rate * 1000:.0f}ms duration"
+            )
+
+            # Fast path: a source that is already 16kHz mono needs no
+            # downmix or resample, so read int16 straight out of
+            # libsndfile with no float stage at all.
+            if source_rate == SAMPLE_RATE and snd.channels == NUM_CHANNELS:
+                return snd.read(dtype="int16")
+
+            resampler = None
+            if source_rate != SAMPLE_RATE:
+                resampler = soxr.ResampleStream(source_rate, SAMPLE_RATE, NUM_CHANNELS, dtype="float32")
+
+            blocks = []
+            for block in snd.blocks(blocksize=source_rate, dtype="float32", always_2d=True):
+                mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+                if resampler is not None:
+                    mono = resampler.resample_chunk(mono)
+                if len(mono):
+                    blocks.append(_float_to_int16(mono))
+            if resampler is not None:
+                tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+                if len(tail):
+                    blocks.append(_float_to_int16(tail))
+
+        return np.concatenate(blocks) if blocks else np.zeros(0, dtype=np.int16)
+
+    def _decode_with_pydub(self, audio_path: Path):
+        """Decode via pydub/ffmpeg for formats libsndfile can't read."""
+        import numpy as np
+        import pydub
+
+        audio_segment = pydub.AudioSegment.from_file(str(audio_path))
+        logger.info(
+            f"Original audio: {audio_segment.frame_rate}Hz, "
+            f"{audio_segment.channels} channel(s), "
+            f"{len(audio_segment)}ms duration"
+        )
+
+        # pydub handles only the decode and downmix; the resample runs
+        # through the vectorized polyphase chain instead of audioop's
+        # scalar LERP in set_frame_rate.
+        audio_segment = audio_segment.set_channels(NUM_CHANNELS).set_sample_width(2)
+
+        # Wrap the raw PCM bytes directly: zero-copy and contiguous,
+        # unlike get_array_of_samples() which builds an array.array that
+        # np.array then copies again.
+        data = np.frombuffer(audio_segment.raw_data, dtype=np.int16)
+        if audio_segment.frame_rate == SAMPLE_RATE:
+            return data
+
+        try:
+            mono = data.astype(np.float32)
+            mono *= 1.0 / 32768.0
+            return _float_to_int16(_resample_mono(mono, audio_segment.frame_rate, SAMPLE_RATE))
+        except ImportError:
+            # Last resort when neither soxr nor scipy is installed.
+            audio_segment = audio_segment.set_frame_rate(SAMPLE_RATE)
+            return np.frombuffer(audio_segment.raw_data, dtype=np.int16)
+
     def _stream_audio_loop(self):
         """Stream audio chunks to virtual microphone (runs in thread)."""
         if self.audio_samples is None:
             logger.error("Audio samples not loaded")
             return
+        if self.virtual_mic is None:
+            logger.error("Virtual microphone not created")
+            return
 
         logger.info("Starting audio stream loop...")
-        chunk_size = int(SAMPLE_RATE * 0.02)  # 20ms chunks
+        write_frames = self.virtual_mic.write_frames
+        frame_size = int(SAMPLE_RATE * 0.02)  # 20ms frames
+        chunk_size = frame_size * FRAMES_PER_WRITE
+        # One contiguous byte buffer with the first super-chunk mirrored
+        # onto the end: every read of up to one super-chunk past the wrap
+        # point stays contiguous, so the loop needs no end-of-buffer
+        # branch before the write and never materializes a seam slice.
+        # Chunk slices remain zero-copy memoryviews.
+        chunk_bytes_len = chunk_size * self.audio_samples.itemsize
+        # Built as one bytearray grown in place — no intermediate copy of
+        # the PCM survives, so steady-state heap stays at one buffer.
+        buf = bytearray(memoryview(self.audio_samples).cast("B"))
+        if not buf:
+            logger.error("Audio buffer is empty")
+            return
+        if len(buf) < chunk_bytes_len:
+            # The wrap arithmetic assumes at least one super-chunk of
+            # source; playback loops anyway, so tiling a short source up
+            # to that length streams the same audio.
+            buf *= -(-chunk_bytes_len // len(buf))
+        total_bytes = len(buf)
+        buf += buf[:chunk_bytes_len]
+        pcm = memoryview(buf)
+        progress_scale = 100.0 / total_bytes
         current_position = 0
         frames_sent = 0
+        writes_sent = 0
         chunk_duration = chunk_size / SAMPLE_RATE  # Duration in seconds
-
-        while self.is_streaming:
-            # Loop audio if we've reached the end
-            if current_position >= len(self.audio_samples):
-                logger.info("Audio finished, looping...")
-                current_position = 0
-
-            end_pos = min(current_position + chunk_size, len(self.audio_samples))
-            chunk = self.audio_samples[current_position:end_pos]
-
-            # Convert to bytes (int16 PCM)
-            chunk_bytes = chunk.tobytes()
-
-            # Write to virtual microphone
-            try:
-                self.virtual_mic.write_frames(chunk_bytes)
-                frames_sent += 1
-                current_position = end_pos
-
-                # Log progress every 50 frames (~1 second)
-                if frames_sent % 50 == 0:
-                    if len(self.audio_samples) > 0:
-                        progress = (current_position % len(self.audio_samples)) / len(self.audio_samples) * 100
-                        logger.info(f"Streaming progress: {progress:.1f}% ({frames_sent} frames sent)")
+        # Pace against absolute deadlines rather than sleeping a fixed
+        # 20ms after each variable-latency write: each iteration sleeps
+        # until its scheduled slot, so write jitter doesn't accumulate
+        # into drift over the life of the stream.
+        monotonic = time.monotonic
+        sleep = time.sleep
+        next_deadline = monotonic() + chunk_duration
+
+        # The try sits around the whole loop rather than inside it: no
+        # exception-handler setup per iteration, and a write failure
+        # still lands in one place that stops the stream.
+        try:
+            while self.is_streaming:
+                write_frames(pcm[current_position:current_position + chunk_bytes_len])
+                frames_sent += FRAMES_PER_WRITE
+                writes_sent += 1
+                current_position += chunk_bytes_len
+                if current_position >= total_bytes:
+                    logger.info("Audio finished, looping...")
+                    current_position -= total_bytes
+
+                # Log progress every 16 writes (~1.6 seconds); the bit test
+                # and precomputed scale keep the per-iteration bookkeeping
+                # to a compare instead of modulo and division.
+                if writes_sent & 15 == 0:
+                    logger.info(
+                        f"Streaming progress: {current_position * progress_scale:.1f}% "
+                        f"({frames_sent} frames sent)"
+                    )
 
                 # Sleep to maintain real-time playback rate (using time.sleep for thread)
-                time.sleep(chunk_duration)
-
-            except Exception as e:
-                logger.error(f"Error writing audio frames: {e}")
-                break
+                delay = next_deadline - monotonic()
+                if delay > 0:
+                    sleep(delay)
+                next_deadline += chunk_duration
+        except Exception as e:
+            logger.error(f"Error writing audio frames: {e}")
+            self.is_streaming = False
 
         logger.info(f"Finished streaming audio - total frames sent: {frames_sent}")
 
@@ -174,32 +408,38 @@ class LocalAudioStreamer:
             return
 
         logger.info("Successfully joined Daily room")
-        # Start streaming audio in a separate thread
+        # Daily invokes this callback on its own thread; hop onto the
+        # event loop so the stream runs as an executor future the loop
+        # can await during cleanup instead of a detached daemon thread.
         self.is_streaming = True
-        self.stream_thread = threading.Thread(target=self._stream_audio_loop, daemon=True)
-        self.stream_thread.start()
+        self._loop.call_soon_threadsafe(self._start_stream_task)
+
+    def _start_stream_task(self) -> None:
+        self.stream_future = self._loop.run_in_executor(self._stream_executor, self._stream_audio_loop)
 
     async def start_streaming(self, audio_path: str):
         """Start streaming local audio file to Daily room."""
+        from daily import CallClient
+
+        self._loop = asyncio.get_running_loop()
+
         try:
             # Initialize Daily
-            Daily.init()
+            _ensure_daily()
 
-            # Load audio file
+            # Load the audio and fetch the token concurrently: the
+            # CPU-bound decode runs on a worker thread while the REST
+            # roundtrip is in flight, so startup costs max() of the two
+            # instead of their sum.
             audio_file_path = Path(audio_path)
-            self.audio_samples = self._load_audio_file(audio_file_path)
-
-            # Get token
-            token = await self._get_token()
+            self.audio_samples, token = await asyncio.gather(
+                asyncio.to_thread(self._load_audio_file, audio_file_path),
+                self._get_token(),
+            )
             logger.info(f"Got Daily token for room: {self.room_url}")
 
-            # Create virtual microphone device
-            self.virtual_mic = Daily.create_microphone_device(
-                "local-audio-mic",
-                sample_rate=SAMPLE_RATE,
-                channels=NUM_CHANNELS,
-                non_blocking=True
-            )
+            # Create (or reuse) the virtual microphone device
+            self.virtual_mic = _get_virtual_mic()
             logger.info("Virtual microphone created")
 
             # Create call client
@@ -211,12 +451,17 @@ class LocalAudioStreamer:
             )
 
             # Join the room
-            # If token is provided, append it to the URL
+            # If token is provided, merge it into the URL's query string.
+            # urlsplit handles existing queries, fragments and encoding,
+            # where probing for "?" misparsed URLs with a #fragment.
             meeting_url = self.room_url
             if token:
-                separator = "&" if "?" in meeting_url else "?"
-                meeting_url = f"{meeting_url}{separator}t={token}"
-            
+                parts = urlsplit(meeting_url)
+                query = parse_qsl(parts.query, keep_blank_values=True)
+                query.append(("t", token))
+                meeting_url = urlunsplit(parts._replace(query=urlencode(query)))
+
+
             logger.info(f"Joining Daily room: {self.room_url}")
             self.keep_running = True
             self.client.join(
@@ -266,10 +511,11 @@ class LocalAudioStreamer:
         self.is_streaming = False
         self.keep_running = False
 
-        # Wait for stream thread to finish
-        if self.stream_thread and self.stream_thread.is_alive():
+        # Wait for stream loop to finish
+        if self.stream_future is not None and not self.stream_future.done():
             logger.info("Waiting for audio stream thread to finish...")
-            self.stream_thread.join(timeout=2.0)
+            await asyncio.wait([self.stream_future], timeout=2.0)
+        self._stream_executor.shutdown(wait=False)
 
         if self.client:
             try:
@@ -279,16 +525,25 @@ class LocalAudioStreamer:
             except Exception as e:
                 logger.warning(f"Error leaving room: {e}")
 
+        if self._http_session is not None:
+            await self._http_session.close()
+            self._http_session = None
+
 
 def find_audio_files(audios_dir: Path) -> list[Path]:
-    """Find all audio files in the audios directory."""
+    """Find all audio files in the audios directory.
+
+    One os.scandir pass with a case-insensitive suffix check, instead
+    of a glob per extension and case (14 directory scans).
+    """
     if not audios_dir.exists():
         return []
 
     audio_files = []
-    for ext in AUDIO_EXTENSIONS:
-        audio_files.extend(audios_dir.glob(f"*{ext}"))
-        audio_files.extend(audios_dir.glob(f"*{ext.upper()}"))
+    with os.scandir(audios_dir) as entries:
+        for entry in entries:
+            if entry.is_file() and Path(entry.name).suffix.lower() in AUDIO_EXTENSIONS:
+                audio_files.append(audios_dir / entry.name)
 
     return sorted(audio_files)
 